@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Square Transport Website - Shared Deployment Helpers
+System and toolchain probes used by run_app.py and deploy_godaddy.py
+"""
+
+import os
+import sys
+import platform
+import subprocess
+import shutil
+import functools
+
+@functools.lru_cache(maxsize=1)
+def detect_system():
+    """Detect operating system and return detailed information"""
+    system_info = {
+        'name': platform.system(),
+        'version': platform.version(),
+        'architecture': platform.architecture()[0],
+        'python_version': sys.version,
+        'platform': platform.platform(),
+        'processor': platform.processor()
+    }
+
+    if system_info['name'] == 'Windows':
+        system_info.update({
+            'package_manager': 'pip',
+            'shell': 'cmd',
+            'path_separator': '\\',
+            'executable_extension': '.exe'
+        })
+    elif system_info['name'] == 'Darwin':  # macOS
+        system_info.update({
+            'package_manager': 'brew',
+            'shell': 'zsh',
+            'path_separator': '/',
+            'executable_extension': ''
+        })
+    elif system_info['name'] == 'Linux':
+        system_info.update({
+            'package_manager': 'apt',
+            'shell': 'bash',
+            'path_separator': '/',
+            'executable_extension': ''
+        })
+
+    return system_info
+
+@functools.lru_cache(maxsize=1)
+def find_npm():
+    """Resolve npm once so it can be run without an intermediate shell"""
+    return shutil.which('npm.cmd' if os.name == 'nt' else 'npm') or 'npm'
+
+@functools.lru_cache(maxsize=1)
+def npm_version():
+    """Return (version, None), or (None, failed CompletedProcess or exception)"""
+    try:
+        result = subprocess.run([find_npm(), '--version'],
+                              capture_output=True,
+                              text=True,
+                              timeout=10)
+    except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired) as e:
+        return None, e
+    if result.returncode != 0:
+        return None, result
+    return result.stdout.strip(), None
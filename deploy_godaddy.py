@@ -5,15 +5,24 @@ Similar to run_app.py but deploys to GoDaddy hosting
 """
 
 import os
+import re
 import sys
-import platform
+import functools
 import subprocess
 import shutil
 import zipfile
 import ftplib
+import logging
+import logging.handlers
+import queue
+import threading
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import time
+import calendar
+
+from deploy_common import detect_system, find_npm, npm_version
 
 # Try to import dotenv, but don't require it
 try:
@@ -24,100 +33,154 @@ except ImportError:
     def load_dotenv():
         pass
 
+@functools.lru_cache(maxsize=1)
+def load_environment():
+    """Load .env once per process"""
+    load_dotenv()
+
+def scan_files(directory, prefix=''):
+    """Yield (relative_path, path, size) for every file below directory"""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            relative_path = prefix + entry.name
+            if entry.is_dir(follow_symlinks=False):
+                yield from scan_files(entry.path, relative_path + '/')
+            elif entry.is_file(follow_symlinks=False):
+                yield relative_path, entry.path, entry.stat(follow_symlinks=False).st_size
+
+# Parallel FTP sessions used for uploading dist/ files (GODADDY_FTP_WORKERS)
+FTP_UPLOAD_WORKERS = 4
+# storbinary block size (1 MiB instead of ftplib's 8 KiB default)
+FTP_BLOCKSIZE = 1 << 20
+# Already-compressed formats that are stored as-is in the deployment zip
+PRECOMPRESSED_SUFFIXES = {'.png', '.jpg', '.jpeg', '.woff2', '.webp', '.gz', '.br', '.mp4'}
+
+# Vite's content-hashed build output, e.g. assets/index-4ed993c7.js. The hash
+# is 8 hex digits; looser classes also match words like hero-overview.png.
+HASHED_ASSET_PATTERN = re.compile(r'/assets/(?:.*/)?[^/]+-[0-9a-f]{8}\.[^/]+$')
+
+# Print an upload progress line every this many files
+PROGRESS_INTERVAL = 32
+
+# Per-file records go to DEBUG and are flushed to the console in batches
+logger = logging.getLogger('deploy')
+if not logger.handlers:
+    logger.addHandler(logging.handlers.MemoryHandler(
+        capacity=64,
+        flushLevel=logging.WARNING,
+        target=logging.StreamHandler(sys.stdout)
+    ))
+    logger.propagate = False
+
 class SquareGoDaddyDeployer:
     def __init__(self):
         self.root_dir = Path(__file__).parent
         self.dist_dir = self.root_dir / 'dist'
-        self.os_info = self.detect_system()
+        self.os_info = detect_system()
+        self._npm = find_npm()
+        # Absolute web root on the FTP server, detected on first connection
+        self._remote_root = None
+        # Sorted (relative_path, path, size) listing of dist/, see index_dist()
+        self._dist_index = None
+        # Session logged in while the build runs, see start_ftp_connection()
+        self._ftp_session = None
+        self._ftp_ready = None
         
         # Load environment variables for FTP credentials
-        load_dotenv()
-        
-    def detect_system(self):
-        """Detect operating system and return detailed information"""
-        system_info = {
-            'name': platform.system(),
-            'version': platform.version(),
-            'architecture': platform.architecture()[0],
-            'python_version': sys.version,
-            'platform': platform.platform()
+        load_environment()
+        self._ftp = {
+            'host': os.getenv('GODADDY_FTP_HOST'),
+            'user': os.getenv('GODADDY_FTP_USERNAME'),
+            'pass': os.getenv('GODADDY_FTP_PASSWORD'),
+            'domain': os.getenv('GODADDY_DOMAIN'),
+            'workers': self.parse_worker_count(os.getenv('GODADDY_FTP_WORKERS'))
         }
+        verbose = os.getenv('GODADDY_VERBOSE', 'false').lower() == 'true'
+        logger.setLevel(logging.DEBUG if verbose else logging.INFO)
         
-        if system_info['name'] == 'Windows':
-            system_info.update({
-                'shell': 'cmd'
-            })
-        elif system_info['name'] == 'Darwin':  # macOS
-            system_info.update({
-                'shell': 'zsh'
-            })
-        elif system_info['name'] == 'Linux':
-            system_info.update({
-                'shell': 'bash'
-            })
-        
-        return system_info
+    def parse_worker_count(self, value):
+        """Parse GODADDY_FTP_WORKERS, falling back to the default if unset or invalid"""
+        if value is None:
+            return FTP_UPLOAD_WORKERS
+        try:
+            return max(1, int(value))
+        except ValueError:
+            print(f"⚠️  Invalid GODADDY_FTP_WORKERS={value!r}, using {FTP_UPLOAD_WORKERS}")
+            return FTP_UPLOAD_WORKERS
 
     def check_npm_availability(self):
         """Check if npm is available and return status"""
-        try:
-            print("🔍 Checking for npm...")
-            result = subprocess.run(['npm', '--version'], 
-                                  capture_output=True, 
-                                  text=True, 
-                                  timeout=10,
-                                  shell=True)
-            if result.returncode == 0:
-                npm_version = result.stdout.strip()
-                print(f"✅ npm found (version {npm_version})")
-                return True
-            else:
-                print("❌ npm not found")
-                return False
-        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-            print("❌ npm not available")
-            return False
+        print("🔍 Checking for npm...")
+        version, failure = npm_version()
+        if failure is None:
+            print(f"✅ npm found (version {version})")
+            return True
+        print("❌ npm not available")
+        return False
 
     def build_website(self):
         """Build the website using Vite"""
         print("\n🔨 Building Square Transport website...")
         try:
-            result = subprocess.run(['npm', 'run', 'build'], 
+            result = subprocess.run([self._npm, 'run', 'build'], 
                                   cwd=self.root_dir, 
-                                  check=True, 
-                                  shell=True)
+                                  check=True)
+            self._dist_index = None  # dist/ was rewritten
             print("✅ Website built successfully")
             return True
         except subprocess.CalledProcessError as e:
             print(f"❌ Build failed: {e}")
             return False
 
+    def index_dist(self):
+        """Walk dist/ once and reuse the listing for upload, zip and summary"""
+        if self._dist_index is None:
+            self._dist_index = sorted(scan_files(self.dist_dir))
+        return self._dist_index
+
     def create_deployment_package(self):
         """Create deployment package for manual upload"""
         print("📦 Creating deployment package...")
         
         zip_path = self.root_dir / 'square-transport-godaddy-deploy.zip'
         
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for file_path in self.dist_dir.rglob('*'):
-                if file_path.is_file():
-                    arcname = file_path.relative_to(self.dist_dir)
+        # pigz compresses on every core; GoDaddy's File Manager extracts
+        # .tar.gz as well as .zip
+        if shutil.which('tar') and shutil.which('pigz'):
+            tar_path = zip_path.with_suffix('.tar.gz')
+            try:
+                subprocess.run(['tar', '--use-compress-program=pigz -1',
+                                '-cf', str(tar_path), '-C', str(self.dist_dir), '.'],
+                               check=True)
+                print(f"  📄 Added {len(self.index_dist())} files")
+                print(f"✅ Deployment package created: {tar_path}")
+                return tar_path
+            except subprocess.CalledProcessError as e:
+                print(f"⚠️  pigz packaging failed ({e}), falling back to zip")
+        
+        file_count = 0
+        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=3) as zipf:
+            for arcname, file_path, _ in self.index_dist():
+                if os.path.splitext(arcname)[1].lower() in PRECOMPRESSED_SUFFIXES:
+                    zipf.write(file_path, arcname, compress_type=zipfile.ZIP_STORED)
+                else:
                     zipf.write(file_path, arcname)
-                    print(f"  📄 Added: {arcname}")
+                logger.debug(f"  📄 Added: {arcname}")
+                file_count += 1
         
+        self.flush_log()
+        print(f"  📄 Added {file_count} files")
         print(f"✅ Deployment package created: {zip_path}")
         return zip_path
 
+    def has_ftp_credentials(self):
+        """Check whether FTP host, username and password are configured"""
+        return all([self._ftp['host'], self._ftp['user'], self._ftp['pass']])
+
     def setup_ftp_config(self):
         """Setup FTP configuration interactively or from environment"""
-        env_file = self.root_dir / '.env'
-        
         # Check if FTP credentials exist
-        ftp_host = os.getenv('GODADDY_FTP_HOST')
-        ftp_username = os.getenv('GODADDY_FTP_USERNAME')
-        ftp_password = os.getenv('GODADDY_FTP_PASSWORD')
-        
-        if not all([ftp_host, ftp_username, ftp_password]):
+        if not self.has_ftp_credentials():
             print("\n🔧 FTP Configuration Setup")
             print("=" * 40)
             print("To enable automatic FTP deployment, add these to your .env file:")
@@ -139,54 +202,247 @@ class SquareGoDaddyDeployer:
             
         print("\n🚀 Deploying to GoDaddy via FTP...")
         
+        ftp = None
         try:
-            ftp_host = os.getenv('GODADDY_FTP_HOST')
-            ftp_username = os.getenv('GODADDY_FTP_USERNAME') 
-            ftp_password = os.getenv('GODADDY_FTP_PASSWORD')
-            
-            # Connect to FTP
-            ftp = ftplib.FTP(ftp_host)
-            ftp.login(ftp_username, ftp_password)
-            
-            # Change to public_html directory
-            try:
-                ftp.cwd('/public_html')
-            except:
-                ftp.cwd('/htdocs')  # Some hosts use htdocs
+            # Connect to FTP (usually already logged in during the build)
+            ftp = self.take_ftp_connection()
             
             print("📡 Connected to GoDaddy FTP server")
             
             # Upload files
-            self.upload_directory_ftp(ftp, self.dist_dir, '/')
+            self.upload_directory_ftp(ftp)
             
-            ftp.quit()
             print("✅ FTP deployment completed successfully!")
             return True
             
         except Exception as e:
             print(f"❌ FTP deployment failed: {e}")
             return False
+        finally:
+            # The main session idles while workers upload and may have been
+            # timed out by the server; that doesn't undo a finished upload
+            if ftp is not None:
+                self.close_ftp(ftp)
+
+    def connect_ftp(self):
+        """Open an authenticated FTP session and detect the web root once"""
+        ftp = ftplib.FTP(self._ftp['host'])
+        try:
+            ftp.login(self._ftp['user'], self._ftp['pass'])
+        except ftplib.all_errors:
+            ftp.close()
+            raise
+        
+        # Find the public_html directory; later sessions use absolute paths
+        if self._remote_root is None:
+            try:
+                ftp.cwd('/public_html')
+                self._remote_root = '/public_html'
+            except ftplib.error_perm:
+                ftp.cwd('/htdocs')  # Some hosts use htdocs
+                self._remote_root = '/htdocs'
+        
+        # Binary mode is set once per session; store_file() never resets it
+        ftp.voidcmd('TYPE I')
+        return ftp
+
+    def start_ftp_connection(self):
+        """Log in to FTP in the background so the handshake overlaps the build"""
+        self._ftp_ready = threading.Event()
+        
+        def connect():
+            try:
+                self._ftp_session = self.connect_ftp()
+            except ftplib.all_errors:
+                self._ftp_session = None  # deploy_via_ftp retries and reports
+            finally:
+                self._ftp_ready.set()
+        
+        threading.Thread(target=connect, daemon=True).start()
 
-    def upload_directory_ftp(self, ftp, local_dir, remote_dir):
-        """Recursively upload directory via FTP"""
-        for item in local_dir.iterdir():
-            if item.is_file():
-                print(f"📤 Uploading: {item.name}")
-                with open(item, 'rb') as f:
-                    ftp.storbinary(f'STOR {item.name}', f)
-            elif item.is_dir():
-                # Create remote directory
+    def take_ftp_connection(self):
+        """Return the background session if it is still alive, else connect"""
+        if self._ftp_ready is not None:
+            self._ftp_ready.wait()
+            ftp = self._ftp_session
+            self._ftp_session = self._ftp_ready = None
+            if ftp is not None:
                 try:
-                    ftp.mkd(item.name)
-                except:
-                    pass  # Directory might already exist
-                ftp.cwd(item.name)
-                self.upload_directory_ftp(ftp, item, remote_dir + item.name + '/')
-                ftp.cwd('..')
+                    ftp.voidcmd('NOOP')  # The server may have dropped it while idle
+                    return ftp
+                except ftplib.all_errors:
+                    ftp.close()
+        return self.connect_ftp()
+
+    def list_remote_dir(self, ftp, path):
+        """Return {name: MLSD facts} for a remote directory, or None without MLSD"""
+        try:
+            return dict(ftp.mlsd(path, facts=['type', 'size', 'modify']))
+        except ftplib.error_perm:
+            return None  # Server does not support MLSD (or path is missing)
+
+    def collect_upload_plan(self, remote_root):
+        """Collect absolute remote directories and (local, remote, size) files"""
+        remote_root = remote_root.rstrip('/')
+        remote_dirs = set()
+        files = []
+        for relative_path, local_path, size in self.index_dist():
+            parts = relative_path.split('/')[:-1]
+            for depth in range(1, len(parts) + 1):
+                remote_dirs.add(remote_root + '/' + '/'.join(parts[:depth]))
+            files.append((size, local_path, remote_root + '/' + relative_path))
+        # Largest files first so no session is left finishing a big upload
+        # alone while the others sit idle
+        files.sort(key=lambda entry: entry[0], reverse=True)
+        # Sorted order guarantees parents are created before their children
+        return sorted(remote_dirs), [(local, remote, size) for size, local, remote in files]
+
+    def upload_directory_ftp(self, ftp):
+        """Upload dist/ via FTP using several parallel sessions"""
+        remote_dirs, files = self.collect_upload_plan(self._remote_root)
+        
+        listings = {}
+        if not files:
+            self.create_remote_dirs(ftp, remote_dirs, listings)
+            return
+        
+        file_queue = queue.Queue()
+        self._progress = {'done': 0, 'total': 0, 'lock': threading.Lock()}
+        dirs_ready = threading.Event()
+        workers = min(self._ftp['workers'], len(files))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Worker sessions connect and log in while the prepass runs
+            futures = [executor.submit(self._upload_worker, file_queue, dirs_ready)
+                       for _ in range(workers)]
+            try:
+                self.create_remote_dirs(ftp, remote_dirs, listings)
+                pending = [entry for entry in files
+                           if not self.is_unchanged_remote(ftp, listings, *entry)]
+                if len(pending) < len(files):
+                    print(f"⏭️  Skipping {len(files) - len(pending)} unchanged files")
+                self._progress['total'] = len(pending)
+                for entry in pending:
+                    file_queue.put(entry)
+            finally:
+                # Workers find an empty queue and exit if the prepass failed
+                dirs_ready.set()
+            try:
+                connected = [future.result() for future in futures]
+                if not any(connected):
+                    # Some hosts allow a single connection per IP
+                    print("📡 Uploading over the main session instead")
+                    self.drain_upload_queue(ftp, file_queue)
+                if not file_queue.empty():
+                    raise ftplib.Error(f"{file_queue.qsize()} files were not uploaded")
+            finally:
+                self.flush_log()
+                if self._progress['total'] and not logger.isEnabledFor(logging.DEBUG):
+                    print()  # End the progress line
+
+    def report_upload(self, remote_path):
+        """Record one finished upload and refresh the progress line"""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"📤 Uploaded: {remote_path}")
+            return
+        progress = self._progress
+        # Printed under the lock so an older count can't overwrite a newer one
+        with progress['lock']:
+            progress['done'] += 1
+            done = progress['done']
+            if done % PROGRESS_INTERVAL == 0 or done == progress['total']:
+                print(f"\r📤 Uploaded {done}/{progress['total']} files", end='', flush=True)
+
+    def flush_log(self):
+        """Write out any batched per-file log records"""
+        for handler in logger.handlers:
+            handler.flush()
+
+    def create_remote_dirs(self, ftp, remote_dirs, listings):
+        """Create missing remote directories, parents before children"""
+        # Done up-front on one session so workers never race on MKD.
+        # One MLSD per parent replaces a failing MKD per existing directory.
+        for remote_dir in remote_dirs:
+            parent, _, name = remote_dir.rpartition('/')
+            if parent not in listings:
+                listings[parent] = self.list_remote_dir(ftp, parent)
+            existing = listings[parent]
+            if existing is not None and existing.get(name, {}).get('type') == 'dir':
+                continue
+            try:
+                ftp.mkd(remote_dir)
+                listings[remote_dir] = {}  # Freshly created, so empty
+            except ftplib.error_perm:
+                pass  # Directory might already exist
+
+    def is_unchanged_remote(self, ftp, listings, local_path, remote_path, size):
+        """Check MLSD facts to decide whether a file can skip re-upload"""
+        parent, _, name = remote_path.rpartition('/')
+        if parent not in listings:
+            listings[parent] = self.list_remote_dir(ftp, parent)
+        facts = (listings[parent] or {}).get(name)
+        if not facts or facts.get('type') != 'file' or facts.get('size') != str(size):
+            return False
+        # Vite names built assets after their content hash, so same name and
+        # size means same bytes even though every build rewrites the mtime
+        if HASHED_ASSET_PATTERN.search(remote_path):
+            return True
+        modify = facts.get('modify')
+        if not modify:
+            return False
+        remote_mtime = calendar.timegm(time.strptime(modify[:14], '%Y%m%d%H%M%S'))
+        return remote_mtime >= os.stat(local_path).st_mtime
+
+    def _upload_worker(self, file_queue, dirs_ready):
+        """Drain the upload queue over a single dedicated FTP session"""
+        # Hosts often cap connections per IP; the sessions that did connect
+        # drain the queue, so one refused login is not a failed deploy
+        try:
+            ftp = self.connect_ftp()
+        except ftplib.all_errors as e:
+            print(f"⚠️  Upload session could not connect: {e}")
+            return False
+        try:
+            dirs_ready.wait()
+            self.drain_upload_queue(ftp, file_queue)
+        finally:
+            self.close_ftp(ftp)
+        return True
+
+    def drain_upload_queue(self, ftp, file_queue):
+        """STOR queued files over one session until the queue is empty"""
+        while True:
+            try:
+                local_path, remote_path, _ = file_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.store_file(ftp, local_path, remote_path)
+            self.report_upload(remote_path)
+
+    def close_ftp(self, ftp):
+        """QUIT a session without letting a dead connection raise over the real error"""
+        try:
+            ftp.quit()
+        except ftplib.all_errors:
+            ftp.close()
+
+    def store_file(self, ftp, local_path, remote_path):
+        """STOR a file on a session already in binary mode"""
+        # Same as ftp.storbinary() minus the per-file TYPE I round trip
+        with open(local_path, 'rb') as f:
+            with ftp.transfercmd(f'STOR {remote_path}') as conn:
+                if hasattr(os, 'sendfile'):
+                    conn.sendfile(f)  # Zero-copy from page cache to socket
+                else:
+                    while True:
+                        buf = f.read(FTP_BLOCKSIZE)
+                        if not buf:
+                            break
+                        conn.sendall(buf)
+        return ftp.voidresp()
 
     def open_website(self):
         """Open the deployed website in browser"""
-        domain = os.getenv('GODADDY_DOMAIN')
+        domain = self._ftp['domain']
         if domain:
             print(f"\n🌐 Opening website: {domain}")
             try:
@@ -208,6 +464,10 @@ class SquareGoDaddyDeployer:
             print("🔧 Please install Node.js from: https://nodejs.org/")
             sys.exit(1)
         
+        # Log in to FTP while the build runs; nothing is stored until it is done
+        if self.has_ftp_credentials():
+            self.start_ftp_connection()
+        
         # Step 2: Build website
         if not self.build_website():
             sys.exit(1)
@@ -249,17 +509,14 @@ class SquareGoDaddyDeployer:
         
         print("\n📁 Files deployed to GoDaddy:")
         print("-" * 40)
-        for file_path in sorted(self.dist_dir.rglob('*')):
-            if file_path.is_file():
-                relative_path = file_path.relative_to(self.dist_dir)
-                file_size = file_path.stat().st_size
-                if file_size > 1024*1024:  # > 1MB
-                    size_str = f"{file_size / (1024*1024):.1f}MB"
-                elif file_size > 1024:  # > 1KB  
-                    size_str = f"{file_size / 1024:.1f}KB"
-                else:
-                    size_str = f"{file_size}B"
-                print(f"  {relative_path} ({size_str})")
+        for relative_path, _, file_size in self.index_dist():
+            if file_size > 1024*1024:  # > 1MB
+                size_str = f"{file_size / (1024*1024):.1f}MB"
+            elif file_size > 1024:  # > 1KB  
+                size_str = f"{file_size / 1024:.1f}KB"
+            else:
+                size_str = f"{file_size}B"
+            print(f"  {relative_path} ({size_str})")
 
     def run(self):
         """Main entry point - similar to run_app.py"""
@@ -6,79 +6,65 @@ Handles environment setup, OS detection, and deployment automation
 
 import os
 import sys
-import platform
 import subprocess
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import time
 import signal
 import atexit
 
+from deploy_common import detect_system, find_npm, npm_version
+
+# Directories never descended into when sweeping for __pycache__, besides
+# any whose name contains 'venv' (venv/, .venv/, ...)
+CLEANUP_SKIP_DIRS = ('.git', 'node_modules')
+# Directories whose CSS/JS get .gz/.br sidecars for WhiteNoise outside debug mode
+SIDECAR_DIRS = ('src/styles', 'src/scripts')
+
 class SquareWebsiteDeployer:
     def __init__(self):
         self.root_dir = Path(__file__).parent
-        self.os_info = self.detect_system()
+        self.os_info = detect_system()
         self.venv_dir = self.root_dir / 'venv'
+        # The OS only decides the venv layout, so resolve it once here
+        if self.os_info['name'] == 'Windows':
+            self.venv_bin_dir = self.venv_dir / 'Scripts'
+            self.executable_suffix = '.exe'
+        else:
+            self.venv_bin_dir = self.venv_dir / 'bin'
+            self.executable_suffix = ''
         self.venv_python = self.get_venv_python_path()
         self.server_process = None
+        self._npm = find_npm()
+        # uv is a much faster drop-in for venv creation and pip installs
+        self._uv = shutil.which('uv')
         
         # Setup graceful shutdown
         self.setup_signal_handlers()
         
-    def detect_system(self):
-        """Detect operating system and return detailed information"""
-        system_info = {
-            'name': platform.system(),
-            'version': platform.version(),
-            'architecture': platform.architecture()[0],
-            'python_version': sys.version,
-            'platform': platform.platform(),
-            'processor': platform.processor()
-        }
-        
-        if system_info['name'] == 'Windows':
-            system_info.update({
-                'package_manager': 'pip',
-                'shell': 'cmd',
-                'path_separator': '\\',
-                'executable_extension': '.exe'
-            })
-        elif system_info['name'] == 'Darwin':  # macOS
-            system_info.update({
-                'package_manager': 'brew',
-                'shell': 'zsh',
-                'path_separator': '/',
-                'executable_extension': ''
-            })
-        elif system_info['name'] == 'Linux':
-            system_info.update({
-                'package_manager': 'apt',
-                'shell': 'bash',
-                'path_separator': '/',
-                'executable_extension': ''
-            })
-        
-        return system_info
-    
     def get_venv_python_path(self):
         """Get the path to the Python executable in the virtual environment"""
-        if self.os_info['name'] == 'Windows':
-            return self.venv_dir / 'Scripts' / 'python.exe'
-        else:
-            return self.venv_dir / 'bin' / 'python'
+        return self.venv_bin_dir / f'python{self.executable_suffix}'
     
     def get_venv_pip_path(self):
         """Get the path to pip in the virtual environment"""
-        if self.os_info['name'] == 'Windows':
-            return self.venv_dir / 'Scripts' / 'pip.exe'
-        else:
-            return self.venv_dir / 'bin' / 'pip'
+        return self.venv_bin_dir / f'pip{self.executable_suffix}'
     
     def create_virtual_environment(self):
         """Create a virtual environment if it doesn't exist"""
         if not self.venv_dir.exists():
             print("🔧 Creating virtual environment...")
             try:
+                if self._uv:
+                    # --seed keeps pip available should uv later go missing
+                    subprocess.run([
+                        self._uv, 'venv', '--seed', '--python', sys.executable,
+                        str(self.venv_dir)
+                    ], check=True)
+                    print("✅ Virtual environment created successfully with uv")
+                    return
+                
                 subprocess.run([
                     sys.executable, '-m', 'venv', str(self.venv_dir)
                 ], check=True)
@@ -136,25 +122,18 @@ class SquareWebsiteDeployer:
     
     def check_npm_availability(self):
         """Check if npm is available and return status"""
-        try:
-            print("🔍 Checking for npm...")
-            result = subprocess.run(['npm', '--version'], 
-                                  capture_output=True, 
-                                  text=True, 
-                                  timeout=10,
-                                  shell=True)  # Add shell=True for Windows
-            if result.returncode == 0:
-                npm_version = result.stdout.strip()
-                print(f"✅ npm found (version {npm_version})")
-                return True
-            else:
-                print(f"❌ npm command failed with return code: {result.returncode}")
-                print(f"stdout: {result.stdout}")
-                print(f"stderr: {result.stderr}")
-                return False
-        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired) as e:
-            print(f"❌ npm check failed with exception: {type(e).__name__}: {e}")
-            return False
+        print("🔍 Checking for npm...")
+        version, failure = npm_version()
+        if failure is None:
+            print(f"✅ npm found (version {version})")
+            return True
+        if isinstance(failure, Exception):
+            print(f"❌ npm check failed with exception: {type(failure).__name__}: {failure}")
+        else:
+            print(f"❌ npm command failed with return code: {failure.returncode}")
+            print(f"stdout: {failure.stdout}")
+            print(f"stderr: {failure.stderr}")
+        return False
         
     def run(self):
         """Main deployment orchestration"""
@@ -276,20 +255,25 @@ TIMEZONE=Europe/Stockholm
         requirements_file = self.root_dir / 'requirements.txt'
         if requirements_file.exists():
             print("📦 Installing Python dependencies in virtual environment...")
-            subprocess.run([
-                str(self.venv_python), '-m', 'pip', 'install', '-r', 
-                str(requirements_file)
-            ], check=True)
+            if self._uv:
+                subprocess.run([
+                    self._uv, 'pip', 'install', '--python', str(self.venv_python),
+                    '-r', str(requirements_file)
+                ], check=True)
+            else:
+                subprocess.run([
+                    str(self.venv_python), '-m', 'pip', 'install', '-r', 
+                    str(requirements_file)
+                ], check=True)
             print("✅ Python dependencies installed in virtual environment")
         
         # Install Node.js dependencies (npm is guaranteed to be available at this point)
         package_json = self.root_dir / 'package.json'
         if package_json.exists():
             print("📦 Installing Node.js dependencies...")
-            subprocess.run(['npm', 'install'], 
+            subprocess.run([self._npm, 'install'], 
                          cwd=self.root_dir, 
-                         check=True,
-                         shell=True)  # Add shell=True for Windows
+                         check=True)
             print("✅ Node.js dependencies installed")
         
         print("✅ All available dependencies installed")
@@ -299,25 +283,40 @@ TIMEZONE=Europe/Stockholm
         print("\n🧹 Cleaning up old build artifacts...")
         
         try:
+            removals = []
+            
             # Clean dist directory (Vite build output)
             dist_dir = self.root_dir / 'dist'
             if dist_dir.exists():
                 print("  📂 Cleaning dist/ directory...")
-                shutil.rmtree(dist_dir)
-                print("  ✅ Removed old dist/ files")
+                removals.append((dist_dir, "  ✅ Removed old dist/ files"))
             
             # Clean server/static/assets directory (unused legacy files)
             server_assets_dir = self.root_dir / 'server' / 'static' / 'assets'
             if server_assets_dir.exists():
                 print("  📂 Cleaning server/static/assets/ directory...")
-                shutil.rmtree(server_assets_dir)
-                print("  ✅ Removed old server/static/assets/ files")
+                removals.append((server_assets_dir, "  ✅ Removed old server/static/assets/ files"))
             
-            # Clean any .pyc files and __pycache__ directories (excluding venv)
-            for pycache_dir in self.root_dir.rglob('__pycache__'):
-                if pycache_dir.is_dir() and 'venv' not in str(pycache_dir):
-                    shutil.rmtree(pycache_dir)
-                    print(f"  ✅ Removed {pycache_dir}")
+            # Clean any .pyc files and __pycache__ directories (excluding venv
+            # and the trees already scheduled for removal above)
+            scheduled = {str(path) for path, _ in removals}
+            for current_dir, dirs, _ in os.walk(self.root_dir):
+                dirs[:] = [d for d in dirs if 'venv' not in d
+                           and d not in CLEANUP_SKIP_DIRS
+                           and os.path.join(current_dir, d) not in scheduled]
+                if '__pycache__' in dirs:
+                    dirs.remove('__pycache__')
+                    pycache_dir = Path(current_dir) / '__pycache__'
+                    removals.append((pycache_dir, f"  ✅ Removed {pycache_dir}"))
+            
+            # The trees are independent, so overlap their unlink syscalls
+            if removals:
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    futures = [(executor.submit(shutil.rmtree, path), message)
+                               for path, message in removals]
+                    for future, message in futures:
+                        future.result()
+                        print(message)
             
             print("✅ Cleanup completed successfully")
             
@@ -325,6 +324,17 @@ TIMEZONE=Europe/Stockholm
             print(f"⚠️  Warning: Cleanup encountered an issue: {e}")
             print("   Continuing with build process...")
     
+    def get_build_environment(self):
+        """Environment for the Vite build, sized to the available cores"""
+        cpu_count = os.cpu_count() or 1
+        env = os.environ.copy()
+        # libuv's fs thread pool backs Rollup's file reads/writes (default is 4)
+        env.setdefault('UV_THREADPOOL_SIZE', str(min(max(cpu_count * 2, 4), 1024)))
+        node_options = env.get('NODE_OPTIONS', '')
+        if '--max-old-space-size' not in node_options:
+            env['NODE_OPTIONS'] = f"{node_options} --max-old-space-size=4096".strip()
+        return env
+    
     def build_frontend(self):
         """Build frontend assets using Vite with cleanup"""
         # Clean up old artifacts first
@@ -332,13 +342,22 @@ TIMEZONE=Europe/Stockholm
         
         print("\n🔨 Building frontend...")
         
-        result = subprocess.run(['npm', 'run', 'build'], 
-                              cwd=self.root_dir, 
-                              capture_output=True, 
-                              text=True,
-                              shell=True)  # Add shell=True for Windows
+        # Stream Vite's log as it is produced instead of buffering all of it
+        build_process = subprocess.Popen([self._npm, 'run', 'build'], 
+                                         cwd=self.root_dir, 
+                                         stdout=subprocess.PIPE, 
+                                         stderr=subprocess.STDOUT,
+                                         text=True,
+                                         encoding='utf-8',
+                                         errors='replace',
+                                         bufsize=1,
+                                         env=self.get_build_environment())
+        with build_process:
+            for line in build_process.stdout:
+                print(line, end='')
+        returncode = build_process.wait()
         
-        if result.returncode == 0:
+        if returncode == 0:
             print("✅ Frontend built successfully with Vite")
             
             # Show build output summary
@@ -353,9 +372,8 @@ TIMEZONE=Europe/Stockholm
                             size_kb = asset_file.stat().st_size / 1024
                             print(f"    - {asset_file.name} ({size_kb:.1f} KB)")
         else:
-            print("❌ Frontend build failed:")
-            print(result.stderr)
-            raise subprocess.CalledProcessError(result.returncode, 'npm run build')
+            print("❌ Frontend build failed (see output above)")
+            raise subprocess.CalledProcessError(returncode, 'npm run build')
     
     def setup_server(self):
         """Setup and configure backend server"""
@@ -368,8 +386,44 @@ TIMEZONE=Europe/Stockholm
         # For development, we'll serve directly from src/
         # No need to copy files around
         print("✅ Server configured to serve from src/ directory")
+        self.refresh_static_sidecars()
         print("✅ Server configured")
     
+    def server_debug_enabled(self):
+        """Resolve DEBUG the way server/app.py will: environment first, then .env"""
+        value = os.getenv('DEBUG')
+        env_file = self.root_dir / '.env'
+        if value is None and env_file.exists():
+            for line in env_file.read_text(encoding='utf-8').splitlines():
+                key, sep, raw = line.strip().partition('=')
+                if sep and key.strip() == 'DEBUG':
+                    value = raw.split('#', 1)[0].strip().strip('\'"')
+        return (value if value is not None else 'true').lower() == 'true'
+    
+    def refresh_static_sidecars(self):
+        """Rebuild the precompressed CSS/JS copies WhiteNoise serves, or drop them in debug mode"""
+        # WhiteNoise serves a .gz/.br next to a file even after the file is
+        # edited, so old sidecars are always removed first
+        sidecar_dirs = [self.root_dir / directory for directory in SIDECAR_DIRS]
+        for directory in sidecar_dirs:
+            for pattern in ('*.gz', '*.br'):
+                for sidecar in directory.rglob(pattern):
+                    if sidecar.with_suffix('').exists():
+                        sidecar.unlink()
+        
+        if self.server_debug_enabled():
+            print("✅ Debug mode: serving CSS/JS uncompressed so edits show up")
+            return
+        
+        for directory in sidecar_dirs:
+            result = subprocess.run([str(self.venv_python), '-m', 'whitenoise.compress',
+                                     '--quiet', str(directory)],
+                                    capture_output=True, text=True)
+            if result.returncode != 0:
+                print(f"⚠️  Could not precompress {directory.name}/: {result.stderr.strip()}")
+                return
+        print("✅ Precompressed CSS/JS for gzip/brotli clients")
+    
     def deploy_application(self):
         """Deploy application based on environment"""
         print("\n🚀 Deploying application...")
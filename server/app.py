@@ -5,130 +5,331 @@ Serves the website and provides API endpoints for dynamic content
 """
 
 import os
+import re
 import sys
+import time
+import gzip
+import hashlib
+import threading
 from pathlib import Path
-from flask import Flask, render_template, send_from_directory, jsonify
+import orjson
+from flask import Flask, render_template, send_file, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from dotenv import load_dotenv
+from whitenoise import WhiteNoise
 
-# Load environment variables
+# Load environment variables, parsed once for both app.config and __main__
 load_dotenv()
+HOST = os.getenv('HOST', 'localhost')
+PORT = int(os.getenv('PORT', 5000))
+DEBUG = os.getenv('DEBUG', 'true').lower() == 'true'
+SECRET_KEY = os.getenv('SECRET_KEY', 'square-transport-secret')
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that encodes with orjson instead of the stdlib json module"""
+
+    def _options(self, pretty):
+        """orjson flags matching the stdlib provider's sort_keys/indent behaviour"""
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        # Explicit json.dumps arguments (indent, cls, ...) need the stdlib encoder
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options(False)).decode()
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self.default, option=self._options(pretty))
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
 
 app = Flask(__name__)
-app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'square-transport-secret')
-app.config['DEBUG'] = os.getenv('DEBUG', 'true').lower() == 'true'
+app.json = OrjsonProvider(app)
+app.config['SECRET_KEY'] = SECRET_KEY
+app.config['DEBUG'] = DEBUG
 
 # Get the root directory
 ROOT_DIR = Path(__file__).parent.parent
 STATIC_DIR = ROOT_DIR / 'src'  # Serve directly from src during development
 DATA_DIR = ROOT_DIR / 'data'
 
+# Paths used per request are built once, as plain strings
+PROBLEM_FILE = str(DATA_DIR / 'Problem statement.txt')
+LINKS_FILE = str(DATA_DIR / 'links.txt')
+INDEX_PAGE = str(STATIC_DIR / 'pages' / 'index.html')
+OVERVIEW_PAGE = str(STATIC_DIR / 'pages' / 'overview.html')
+ABOUT_PAGE = str(STATIC_DIR / 'pages' / 'about.html')
+
+# Static files are served by WhiteNoise in front of Flask. It indexes the
+# files up-front and serves .gz/.br sidecars to clients that accept them;
+# run_app.py regenerates those for src/styles and src/scripts on launch
+# outside debug mode and removes them in debug mode, since WhiteNoise would
+# keep serving a sidecar after its source is edited. In debug mode it also
+# rescans on each request and disables caching.
+STATIC_PREFIXES = {
+    'static/': str(STATIC_DIR),
+    'assets/': str(STATIC_DIR / 'assets'),
+    'styles/': str(STATIC_DIR / 'styles'),
+    'scripts/': str(STATIC_DIR / 'scripts')
+}
+# Vite's content-hashed build output, e.g. assets/index-4ed993c7.js, never
+# changes under the same name and can be cached for good; everything else
+# is cached briefly, like the pages. The hash is 8 hex digits, so ordinary
+# names like hero-overview.png in src/ don't match.
+HASHED_ASSET_PATTERN = r'/assets/(?:.*/)?[^/]+-[0-9a-f]{8}\.[^/]+$'
+PAGE_MAX_AGE = 0 if DEBUG else 60
+app.wsgi_app = WhiteNoise(
+    app.wsgi_app,
+    autorefresh=DEBUG,
+    max_age=PAGE_MAX_AGE,
+    immutable_file_test=None if DEBUG else HASHED_ASSET_PATTERN
+)
+for _prefix, _directory in STATIC_PREFIXES.items():
+    app.wsgi_app.add_files(_directory, prefix=_prefix)
+
+# Serialized /api/company-data (body, etag), rebuilt only when the data files change.
+# The files are stat()ed at most once per interval rather than on every request.
+_COMPANY_CACHE = {'key': None, 'entry': None, 'checked': float('-inf')}
+_COMPANY_CACHE_LOCK = threading.Lock()
+_COMPANY_RECHECK_SECONDS = 1.0
+
+# Constant parts of the company-data payload (treat as read-only)
+_STATIC_PAYLOAD = {
+    'market_data': {
+        'total_addressable_market': '$500M',
+        'serviceable_addressable_market': '$200M',
+        'serviceable_obtainable_market': '$15M'
+    },
+    'benefits': {
+        'cost_reduction': '70%',
+        'energy_reduction': '80%',
+        'carbon_reduction': '90%'
+    }
+}
+_WINNER_ACHIEVEMENT = {
+    'title': 'Winner - Startup Challenge',
+    'description': 'Square wins Startup Challenge with AI-based delivery robots'
+}
+
+# links.txt is scanned whole by these, one findall() each, instead of line by
+# line in Python. The award article wins over a Founder profile on the same
+# line; for a profile only the line's first token is kept.
+_ACHIEVEMENT_LINE = re.compile(r'^.*innovatumsciencepark\.se.*$', re.MULTILINE)
+_FOUNDER_LINE = re.compile(
+    r'^(?!.*innovatumsciencepark\.se)(?=.*linkedin\.com/in/)(?=.*Founder)\s*(\S+)',
+    re.MULTILINE
+)
+
+def _file_mtime(path):
+    """Return the file's mtime in ns, or None if it does not exist"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def _read_utf8(path):
+    """Read a whole file as UTF-8 in one read and decode, or '' if it is missing"""
+    # Opening directly instead of exists() + open() saves a stat per file,
+    # and skipping TextIOWrapper avoids its chunked decode
+    try:
+        with open(path, 'rb') as f:
+            return f.read().decode('utf-8')
+    except FileNotFoundError:
+        return ""
+
+def _load_page(path):
+    """Read a page into memory with a gzip copy, its ETag and modification time"""
+    try:
+        with open(path, 'rb') as f:
+            body = f.read()
+    except FileNotFoundError:
+        return None
+    # Compressed once here rather than per request; mtime=0 keeps it stable
+    gzipped = gzip.compress(body, compresslevel=9, mtime=0)
+    etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+    return body, gzipped, etag, os.stat(path).st_mtime
+
+# The pages are small and hit on every visit, so production keeps them in
+# memory; debug mode reads them from disk so edits to src/ show up
+_HOT_PAGES = {} if DEBUG else {
+    path: entry for path in (INDEX_PAGE, OVERVIEW_PAGE, ABOUT_PAGE)
+    if (entry := _load_page(path)) is not None
+}
+
+def _send_page(path):
+    """Serve an HTML page from memory when cached, otherwise from disk"""
+    entry = _HOT_PAGES.get(path)
+    if entry is None:
+        return send_file(path, conditional=True, etag=True, max_age=PAGE_MAX_AGE)
+    body, gzipped, etag, mtime = entry
+    if request.accept_encodings['gzip'] and len(gzipped) < len(body):
+        response = app.response_class(gzipped, mimetype='text/html')
+        response.content_encoding = 'gzip'
+        body, etag = gzipped, etag + '-gz'  # Each encoding needs its own ETag
+    else:
+        response = app.response_class(body, mimetype='text/html')
+    response.vary.add('Accept-Encoding')
+    response.set_etag(etag)
+    response.last_modified = mtime
+    response.cache_control.public = True
+    response.cache_control.max_age = PAGE_MAX_AGE
+    return response.make_conditional(request, accept_ranges=True, complete_length=len(body))
+
 @app.route('/')
 def index():
     """Landing page - showcase Square's delivery robots"""
-    return send_from_directory(STATIC_DIR / 'pages', 'index.html')
+    return _send_page(INDEX_PAGE)
 
 @app.route('/overview')
 def overview():
     """Overview page - detailed product information"""
-    return send_from_directory(STATIC_DIR / 'pages', 'overview.html')
+    return _send_page(OVERVIEW_PAGE)
 
 @app.route('/about')
 def about():
     """About page - team and company information"""
-    return send_from_directory(STATIC_DIR / 'pages', 'about.html')
-
-@app.route('/static/<path:filename>')
-def static_files(filename):
-    """Serve static files (CSS, JS, images)"""
-    return send_from_directory(STATIC_DIR, filename)
+    return _send_page(ABOUT_PAGE)
 
-@app.route('/assets/<path:filename>')
-def asset_files(filename):
-    """Serve asset files"""
-    return send_from_directory(STATIC_DIR / 'assets', filename)
-
-@app.route('/styles/<path:filename>')
-def style_files(filename):
-    """Serve CSS files"""
-    return send_from_directory(STATIC_DIR / 'styles', filename)
+def _build_company_data():
+    """Read and parse the data files into the company-data payload"""
+    # Read problem statement (CRLF is folded like text mode would)
+    problem_statement = _read_utf8(PROBLEM_FILE).replace('\r\n', '\n')
+    
+    # Read links; a CR left by CRLF endings is stripped off the matches below
+    links_data = _read_utf8(LINKS_FILE)
+    
+    # Process achievements from links
+    achievements = [
+        {**_WINNER_ACHIEVEMENT, 'url': line.strip()}
+        for line in _ACHIEVEMENT_LINE.findall(links_data)
+    ]
+    team_members = [
+        {'role': 'Founder', 'url': url}
+        for url in _FOUNDER_LINE.findall(links_data)
+    ]
+    
+    return {
+        **_STATIC_PAYLOAD,
+        'problem_statement': problem_statement,
+        'achievements': achievements,
+        'team_members': team_members
+    }
 
-@app.route('/scripts/<path:filename>')
-def script_files(filename):
-    """Serve JavaScript files"""
-    return send_from_directory(STATIC_DIR / 'scripts', filename)
+def _refresh_company_cache():
+    """Rebuild the cached company-data body if either data file has changed"""
+    key = (_file_mtime(PROBLEM_FILE), _file_mtime(LINKS_FILE))
+    if _COMPANY_CACHE['key'] != key:
+        with _COMPANY_CACHE_LOCK:
+            if _COMPANY_CACHE['key'] != key:
+                body = app.json.response(_build_company_data()).get_data()
+                etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+                # Entry first, so a reader that sees the new key sees it too
+                _COMPANY_CACHE['entry'] = (body, etag)
+                _COMPANY_CACHE['key'] = key
+    _COMPANY_CACHE['checked'] = time.monotonic()
 
 @app.route('/api/company-data')
 def get_company_data():
     """API endpoint to get company data"""
     try:
-        # Read problem statement
-        problem_file = DATA_DIR / 'Problem statement.txt'
-        problem_statement = ""
-        if problem_file.exists():
-            with open(problem_file, 'r', encoding='utf-8') as f:
-                problem_statement = f.read()
-        
-        # Read links
-        links_file = DATA_DIR / 'links.txt'
-        links_data = ""
-        if links_file.exists():
-            with open(links_file, 'r', encoding='utf-8') as f:
-                links_data = f.read()
-        
-        # Process achievements from links
-        achievements = []
-        team_members = []
+        if time.monotonic() - _COMPANY_CACHE['checked'] >= _COMPANY_RECHECK_SECONDS:
+            _refresh_company_cache()
         
-        for line in links_data.split('\n'):
-            if 'innovatumsciencepark.se' in line:
-                achievements.append({
-                    'title': 'Winner - Startup Challenge',
-                    'description': 'Square wins Startup Challenge with AI-based delivery robots',
-                    'url': line.strip()
-                })
-            elif 'linkedin.com/in/' in line and 'Founder' in line:
-                team_members.append({
-                    'role': 'Founder',
-                    'url': line.split()[0]
-                })
-        
-        return jsonify({
-            'problem_statement': problem_statement,
-            'achievements': achievements,
-            'team_members': team_members,
-            'market_data': {
-                'total_addressable_market': '$500M',
-                'serviceable_addressable_market': '$200M',
-                'serviceable_obtainable_market': '$15M'
-            },
-            'benefits': {
-                'cost_reduction': '70%',
-                'energy_reduction': '80%',
-                'carbon_reduction': '90%'
-            }
-        })
+        body, etag = _COMPANY_CACHE['entry']
+        if request.if_none_match.contains_weak(etag):
+            response = app.response_class(status=304)
+        else:
+            response = app.response_class(body, mimetype='application/json')
+        response.set_etag(etag, weak=True)
+        response.cache_control.max_age = 60
+        return response
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+_HEALTH_STATUS = {
+    'status': 'healthy',
+    'service': 'Square Transport Website',
+    'version': '1.0.0'
+}
+
 @app.route('/api/health')
 def health_check():
     """Health check endpoint"""
-    return jsonify({
-        'status': 'healthy',
-        'service': 'Square Transport Website',
-        'version': '1.0.0'
-    })
+    return jsonify(_HEALTH_STATUS)
+
+# Load balancers poll the health check constantly and its answer never
+# changes, so GETs are answered with pre-serialized bytes before WhiteNoise
+# or Flask see the request. Other methods still go through health_check().
+_HEALTH_BODY = app.json.response(_HEALTH_STATUS).get_data()
+_HEALTH_HEADERS = [
+    ('Content-Type', 'application/json'),
+    ('Content-Length', str(len(_HEALTH_BODY)))
+]
+_serve_app = app.wsgi_app
+
+def _health_wsgi_app(environ, start_response):
+    """WSGI entry point that short-circuits GET /api/health"""
+    if environ.get('PATH_INFO') == '/api/health' and environ.get('REQUEST_METHOD') == 'GET':
+        start_response('200 OK', _HEALTH_HEADERS)
+        return [_HEALTH_BODY]
+    return _serve_app(environ, start_response)
+
+app.wsgi_app = _health_wsgi_app
+
+# Warm the company-data cache so the first request doesn't pay for the build
+try:
+    _refresh_company_cache()
+except Exception as e:
+    print(f"⚠️  Could not preload company data: {e}")
 
 if __name__ == '__main__':
-    host = os.getenv('HOST', 'localhost')
-    port = int(os.getenv('PORT', 5000))
-    debug = os.getenv('DEBUG', 'true').lower() == 'true'
-    
     print(f"🚀 Starting Square Transport Website Server")
-    print(f"🌐 Server running at: http://{host}:{port}")
+    print(f"🌐 Server running at: http://{HOST}:{PORT}")
     print(f"📱 Mobile-optimized responsive design")
     print(f"⚡ GSAP animations and smooth interactions")
     print(f"🎯 Swedish design aesthetics")
     
-    app.run(host=host, port=port, debug=debug)
+    if DEBUG:
+        app.run(host=HOST, port=PORT, debug=DEBUG)
+    else:
+        try:
+            from gunicorn.app.base import BaseApplication
+        except ImportError:  # e.g. Windows, where gunicorn can't run
+            BaseApplication = None
+        if BaseApplication is not None:
+            import runpy
+            
+            class GunicornServer(BaseApplication):
+                """Gunicorn serving the app already built by this module"""
+                
+                def load_config(self):
+                    # Same settings as 'gunicorn -c gunicorn_conf.py', bound to HOST:PORT
+                    conf = runpy.run_path(str(Path(__file__).parent / 'gunicorn_conf.py'))
+                    for key, value in conf.items():
+                        if key in self.cfg.settings and value is not None:
+                            self.cfg.set(key, value)
+                    self.cfg.set('bind', f'{HOST}:{PORT}')
+                
+                def load(self):
+                    # Re-importing app would rebuild the static index and caches
+                    return app
+            
+            # Pre-forked gthread workers, see gunicorn_conf.py
+            GunicornServer().run()
+        else:
+            try:
+                import uvicorn
+                import asgiref  # noqa: F401 - needed by asgi.py in every worker
+            except ImportError:
+                app.run(host=HOST, port=PORT, debug=DEBUG)
+            else:
+                # One process per core instead of Werkzeug's single dev process
+                uvicorn.run('asgi:asgi_app', host=HOST, port=PORT,
+                            workers=os.cpu_count() or 1)
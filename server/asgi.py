@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""
+Square Transport Website - ASGI Entry Point
+Wraps the Flask app for ASGI servers (requires: pip install uvicorn asgiref)
+
+    uvicorn asgi:asgi_app --app-dir server --workers 4
+"""
+
+from asgiref.wsgi import WsgiToAsgi
+
+from app import app
+
+asgi_app = WsgiToAsgi(app)
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Square Transport Website - Gunicorn Configuration
+Production server settings for the Flask app
+
+    gunicorn -c server/gunicorn_conf.py app:app
+"""
+
+import os
+import multiprocessing
+
+# Run from server/ so "app:app" resolves no matter where gunicorn is started
+chdir = os.path.dirname(os.path.abspath(__file__))
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5000')}"
+
+# Several processes, each with a thread pool for blocking file I/O
+workers = multiprocessing.cpu_count() * 2 + 1
+worker_class = 'gthread'
+threads = 8
+
+# Import the app (and warm its caches) once in the master, then fork
+preload_app = True
+
+# Worker heartbeat files in RAM rather than on a possibly slow disk
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None